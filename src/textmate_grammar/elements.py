@@ -23,6 +23,17 @@ class Capture:
     The Capture object stores this subsequent parse to be dispatched at a later moment.
     """
 
+    __slots__ = [
+        "handler",
+        "pattern",
+        "matching",
+        "parsers",
+        "starting",
+        "boundary",
+        "key",
+        "kwargs",
+    ]
+
     def __init__(
         self,
         handler: ContentHandler,
@@ -78,8 +89,9 @@ class Capture:
         :return: A list of Capture or ContentElement objects representing the parsed elements.
         """
         elements = []
+        number_of_captures = self.pattern.number_of_captures()
         for group_id, parser in self.parsers.items():
-            if group_id > self.pattern.number_of_captures():
+            if group_id > number_of_captures:
                 LOGGER.warning(
                     f"The capture group {group_id} does not exist in pattern {self.pattern._pattern}"
                 )
@@ -145,33 +157,88 @@ def _str_to_list(input: str | list[str]) -> list[str]:
 class ContentElement:
     """The parsed grammar element."""
 
+    __slots__ = [
+        "token",
+        "grammar",
+        "_content",
+        "_characters",
+        "_handler",
+        "_span",
+        "_children_captures",
+        "_children",
+        "_dispatched",
+        "parent",
+    ]
+
     def __init__(
         self,
         token: str,
         grammar: dict,
-        content: str,
-        characters: dict[POS, str],
+        content: str | None = None,
+        characters: dict[POS, str] | None = None,
         children: list[Capture | ContentElement] | None = None,
+        handler: ContentHandler | None = None,
+        span: tuple[POS, POS] | None = None,
     ) -> None:
         """
         Initialize a new instance of the Element class.
 
+        The content and characters can either be provided directly, or be read lazily from the handler
+        between the positions of the span once they are first accessed.
+
         :param token: The token associated with the element.
         :param grammar: The grammar associated with the element.
-        :param content: The content associated with the element.
-        :param characters: The characters associated with the element.
+        :param content: The content associated with the element. Defaults to None.
+        :param characters: The characters associated with the element. Defaults to None.
         :param children: The children associated with the element. Defaults to None.
+        :param handler: The content handler to read the content and characters from. Defaults to None.
+        :param span: The starting and closing positions of the element in the handler. Defaults to None.
         """
         if children is None:
             children = []
+        if (content is None or characters is None) and (handler is None or span is None):
+            raise ValueError(
+                "Either the content and characters or the handler and span must be provided"
+            )
         self.token = token
         self.grammar = grammar
-        self.content = content
-        self.characters = characters
+        self._content = content
+        self._characters = characters
+        self._handler = handler
+        self._span = span
         self._children_captures = children
         self._dispatched: bool = False
         self.parent: ContentElement | None = None
 
+    @property
+    def content(self) -> str:
+        """The content of the element, read from the content handler on first access."""
+        if self._content is None:
+            self._content = self._handler.read_pos(*self._span)  # type: ignore[union-attr, misc]
+        return self._content
+
+    @property
+    def characters(self) -> dict[POS, str]:
+        """The characters of the element by position, read from the content handler on first access."""
+        if self._characters is None:
+            self._characters = self._handler.chars(*self._span)  # type: ignore[union-attr, misc]
+        return self._characters
+
+    def __getstate__(self) -> dict:
+        # Read the content and characters such that the content handler is not pickled
+        state = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", [])
+            if hasattr(self, name)
+        }
+        state.update(_content=self.content, _characters=self.characters, _handler=None, _span=None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
     @property
     def _subelements(self) -> list[ContentElement]:
         return self.children
@@ -445,6 +512,8 @@ class ContentElement:
 class ContentBlockElement(ContentElement):
     """A parsed element with a begin and a end"""
 
+    __slots__ = ["_begin_captures", "_end_captures", "_begin", "_end"]
+
     def __init__(
         self,
         *args,
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+from itertools import accumulate
 from pathlib import Path
 from typing import Callable
 
 import charset_normalizer as charset
 from onigurumacffi import _Match as Match
-from onigurumacffi import _Pattern as Pattern
+from onigurumacffi import _RegSet as RegSet
 from onigurumacffi import compile
 
 from .utils.exceptions import FileNotFound, ImpossibleSpan
 from .utils.logger import LOGGER
+from .utils.patterns import Pattern
 
 POS = tuple[int, int]
 
@@ -28,6 +30,7 @@ class ContentHandler:
     """
 
     notLookForwardEOL = compile(r"(?<!\(\?=[^\(]*)\$")
+    _pattern_flags: dict[str, tuple[bool, bool, bool]] = {}
 
     def __init__(
         self, content: str, pre_processor: Callable[[str], str] = _dummy_pre_processor
@@ -43,7 +46,11 @@ class ContentHandler:
         :ivar content: The source code to be processed.
         :ivar lines: A list of lines in the source code, with a newline character at the end of each line.
         :ivar line_lengths: A list of lengths of each line in the source code.
+        :ivar source: The source code as a single string, including the newline characters of all lines.
+        :ivar line_offsets: A list of offsets of the start of each line in the source string.
+        :ivar content_lines: For each line, the number of the first line from there on that is not empty.
         :ivar anchor: The current position in the source code.
+        :ivar _search_cache: The previous search results per pattern and line, see :meth:`_get_cached_search`.
         """
         # Proprocess the content, replace all newline characters with \n
         prepared_content = pre_processor(content.replace("\r\n", "\n").replace("\r", "\n"))
@@ -51,7 +58,17 @@ class ContentHandler:
         self.content = prepared_content
         self.lines = [line + "\n" for line in prepared_content.split("\n")]
         self.line_lengths = [len(line) for line in self.lines]
+        self.source = "".join(self.lines)
+        self.line_offsets = list(accumulate(self.line_lengths, initial=0))
+        self.content_lines = [len(self.lines)] * (len(self.lines) + 1)
+        for line_number in reversed(range(len(self.lines))):
+            self.content_lines[line_number] = (
+                line_number
+                if self.line_lengths[line_number] > 1
+                else self.content_lines[line_number + 1]
+            )
         self.anchor: int = 0
+        self._search_cache: dict[tuple[Pattern, int, int], tuple[int, int, Match | None]] = {}
 
     @classmethod
     def from_path(cls, file_path: Path, **kwargs) -> ContentHandler:
@@ -65,6 +82,75 @@ class ContentHandler:
 
         return cls(content, **kwargs)
 
+    @classmethod
+    def _get_pattern_flags(cls, pattern: Pattern) -> tuple[bool, bool, bool]:
+        """Returns the search flags of a pattern, which are computed once per pattern source.
+
+        :param pattern: The regular expression pattern.
+        :return: A tuple of booleans indicating whether the pattern matches the end of the stream (\\z),
+            is anchored to the previous match (\\G), and matches the end of line ($) without lookahead.
+        """
+        source = pattern._pattern
+        flags = cls._pattern_flags.get(source)
+        if flags is None:
+            flags = (
+                source in ["\\z", "\\Z"],
+                "\\G" in source,
+                bool(cls.notLookForwardEOL.search(source)),
+            )
+            cls._pattern_flags[source] = flags
+        return flags
+
+    def _get_cached_search(
+        self, pattern: Pattern, line_number: int, length: int, start: int
+    ) -> tuple[bool, Match | None]:
+        """Looks up an earlier search of a pattern on the first ``length`` characters of a line.
+
+        The leftmost match when searching from a position is also the leftmost match when searching from
+        any later position up to the start of that match. Similarly, if there is no match from a position,
+        there is no match from any later position.
+
+        :return: A tuple of whether the earlier search holds when searching from the start position, and
+            its matching result.
+        """
+        cached = self._search_cache.get((pattern, line_number, length))
+        if cached is not None:
+            cached_start, match_start, cached_matching = cached
+            if cached_start <= start and (cached_matching is None or start <= match_start):
+                return True, cached_matching
+        return False, None
+
+    def _search_line(
+        self, pattern: Pattern, line: str, line_number: int, start: int, anchored: bool
+    ) -> Match | None:
+        """Searches a pattern on a line, reusing the result of an earlier search where possible.
+
+        Patterns anchored with \\G depend on the search position and are always searched.
+        """
+        if anchored:
+            return pattern.search(line, start=start)
+
+        cached, matching = self._get_cached_search(pattern, line_number, len(line), start)
+        if cached:
+            return matching
+
+        matching = pattern.search(line, start=start)
+        match_start = matching.start() if matching else -1
+        self._search_cache[(pattern, line_number, len(line))] = (start, match_start, matching)
+        return matching
+
+    def next_content_line(self, line_number: int) -> int | None:
+        """Returns the number of the first line that is not empty, starting from a line.
+
+        :param line_number: The line to start from.
+        :return: The line number, or None if all remaining lines are empty.
+        """
+        content_line = self.content_lines[min(line_number, len(self.lines))]
+        return content_line if content_line < len(self.lines) else None
+
+    def _offset(self, pos: POS) -> int:
+        return self.line_offsets[pos[0]] + pos[1]
+
     def _check_pos(self, pos: POS):
         if pos[0] > len(self.lines) or pos[1] > self.line_lengths[pos[0]]:
             raise ImpossibleSpan
@@ -134,7 +220,13 @@ class ContentHandler:
         :return: A dictionary mapping each position within the range to the corresponding source character.
         """
         indices = self.range(start, close)
-        return {pos: self.read(pos) for pos in indices}
+        offset = self._offset(start)
+        characters = self.source[offset : offset + len(indices)]
+
+        # Newline characters are read as empty strings, consistent with read(pos)
+        return {
+            pos: "" if characters[i] == "\n" else characters[i] for i, pos in enumerate(indices)
+        }
 
     def read_pos(self, start_pos: POS, close_pos: POS, skip_newline: bool = True) -> str:
         """Reads the content between the start and end positions.
@@ -150,17 +242,7 @@ class ContentHandler:
         if start_pos > close_pos:
             raise ImpossibleSpan
 
-        if start_pos[0] == close_pos[0]:
-            readout = self.lines[start_pos[0]][start_pos[1] : close_pos[1]]
-        else:
-            readout = ""
-            for ln in range(start_pos[0], close_pos[0] + 1):
-                if ln == start_pos[0]:
-                    readout += self.lines[ln][start_pos[1] :]
-                elif ln == close_pos[0]:
-                    readout += self.lines[ln][: close_pos[1]]
-                else:
-                    readout += self.lines[ln]
+        readout = self.source[self._offset(start_pos) : self._offset(close_pos)]
 
         if skip_newline and readout and readout[-1] == "\n":
             readout = readout[:-1]
@@ -192,24 +274,13 @@ class ContentHandler:
             raise ImpossibleSpan
 
         remainder = self.line_lengths[start_pos[0]] - start_pos[1]
+        if length > remainder and start_pos[0] + 1 >= len(self.lines):
+            return ""
 
-        if length <= remainder:
-            readout = self.lines[start_pos[0]][start_pos[1] : (start_pos[1] + length)]
-        else:
-            readout = self.lines[start_pos[0]][start_pos[1] :]
-            unread_length = length - remainder
-            ln = start_pos[0] + 1
-            if ln >= len(self.lines):
-                return ""
-
-            while unread_length > self.line_lengths[ln]:
-                readout += self.lines[ln]
-                unread_length -= self.line_lengths[ln]
-                ln += 1
-            else:
-                readout += self.lines[ln][:unread_length]
+        offset = self._offset(start_pos)
+        readout = self.source[offset : offset + length]
 
-        if skip_newline and readout[-1] == "\n":
+        if skip_newline and readout and readout[-1] == "\n":
             readout = readout[:-1]
 
         return readout
@@ -248,32 +319,45 @@ class ContentHandler:
                 - `2`: any character allowed.
         """
 
-        if pattern._pattern in ["\\z", "\\Z"]:
+        end_of_string, anchored, end_of_line = self._get_pattern_flags(pattern)
+        if end_of_string:
             greedy = True
 
+        # Fast path: return a previous search on the line that found no match from an earlier position
+        if not anchored:
+            length = self.line_lengths[starting[0]]
+            if boundary is not None and starting[0] == boundary[0]:
+                length = min(boundary[1], length)
+            cached, matching = self._get_cached_search(pattern, starting[0], length, starting[1])
+            if cached and matching is None:
+                return None, None
+
         # Get line from starting (and boundary) positions
-        if boundary and starting[0] == boundary[0]:
-            line = self.lines[starting[0]][: boundary[1]]
-        else:
-            line = self.lines[starting[0]]
+        line = (
+            self.lines[starting[0]][: boundary[1]]
+            if boundary is not None and starting[0] == boundary[0]
+            else self.lines[starting[0]]
+        )
 
         # Gets the previous matching end position from anchor in case of \G.
-        init_pos = self.anchor if "\\G" in pattern._pattern else starting[1]
+        init_pos = self.anchor if anchored else starting[1]
 
         # Find begin of line and search starting from the initial position
-        matching = pattern.search(line, start=init_pos)
+        matching = self._search_line(pattern, line, starting[0], init_pos, anchored)
+
+        if not matching:
+            return None, None
 
         # Check that no charaters are skipped in case ws-only is enabled
-        if matching:
-            leading_string = line[init_pos : matching.start()]
-            if leading_string and not (greedy or (not greedy and leading_string.isspace())):
-                return None, None
-        else:
+        match_start = matching.start()
+        leading_string = line[init_pos:match_start]
+        if leading_string and not (greedy or leading_string.isspace()):
             return None, None
 
         # Get span of current matching, taking into account the lookback operation
-        start_pos = (starting[0], matching.start())
-        close_pos = (starting[0], matching.end())
+        match_end = matching.end()
+        start_pos = (starting[0], match_start)
+        close_pos = (starting[0], match_end)
 
         # Do not allow matching past a boundary positition, if provided
         if boundary and close_pos > boundary:
@@ -287,15 +371,35 @@ class ContentHandler:
             )
 
         # Include \n in match span if pattern matches on end of line $
-        if (
-            self.notLookForwardEOL.search(pattern._pattern)
-            and matching.end() + 1 == self.line_lengths[starting[0]]
-        ):
+        if end_of_line and match_end + 1 == self.line_lengths[starting[0]]:
             newline_matching = pattern.search(line[:-1])
-            if newline_matching and newline_matching.span() == matching.span():
-                close_pos = (starting[0], matching.end() + 1)
+            if newline_matching and newline_matching.span() == (match_start, match_end):
+                close_pos = (starting[0], match_end + 1)
 
         # Set anchor for next matching
-        self.anchor = matching.end()
+        self.anchor = match_end
 
         return matching, (start_pos, close_pos)
+
+    def search_set(
+        self, pattern_set: RegSet, starting: POS, boundary: POS | None = None
+    ) -> int | None:
+        """Finds the earliest match of any pattern of a pattern set on the remainder of the current line.
+
+        All patterns in the set are scanned in a single pass of the regex engine. This is used as a
+        prefilter before searching each pattern individually with :meth:`search`.
+
+        :param pattern_set: The oniguruma regset to match against the stream.
+        :param starting: The starting position in the stream.
+        :param boundary: The boundary position in the stream. Defaults to None.
+        :return: The line position of the earliest match, or None if none of the patterns match.
+        """
+        if boundary and starting[0] == boundary[0]:
+            line = self.lines[starting[0]][: boundary[1]]
+        else:
+            line = self.lines[starting[0]]
+
+        index, matching = pattern_set.search(line, start=starting[1])
+        if index < 0 or matching is None:
+            return None
+        return matching.start()
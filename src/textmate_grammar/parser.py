@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import json
+import logging
+import sys
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
 import onigurumacffi as re
 
 from .elements import Capture, ContentBlockElement, ContentElement
-from .handler import POS, ContentHandler, Pattern
+from .handler import POS, ContentHandler, Pattern, RegSet
+from .utils import patterns as pattern_utils
 from .utils.exceptions import IncludedParserNotFound
 from .utils.logger import LOGGER, track_depth
+from .utils.patterns import compile_pattern
 
 if TYPE_CHECKING:
     from .parsers.base import LanguageParser
@@ -61,7 +66,8 @@ class GrammarParser(ABC):
         self.grammar = grammar
         self.language_parser = language_parser
         self.key = key
-        self.token = grammar.get("name", "")
+        # Tokens are interned, as they are shared by all elements of the parser and compared often
+        self.token = sys.intern(grammar.get("name", ""))
         self.is_capture = is_capture
         self.initialized = False
         self.anchored = False
@@ -77,14 +83,45 @@ class GrammarParser(ABC):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}:<{self.key}>"
 
+    def __getstate__(self) -> dict:
+        # Compiled patterns can not be pickled, these are stored by their source and compiled on first access
+        state = self.__dict__.copy()
+        sources = dict(state.get("_pattern_sources", {}))
+        for name in [name for name in state if name.startswith("exp_")]:
+            sources[name] = state.pop(name)._pattern
+        state["_pattern_sources"] = sources
+        return state
+
+    def __getattr__(self, name: str):
+        sources = self.__dict__.get("_pattern_sources", {})
+        if name not in sources:
+            raise AttributeError(f"{self.__class__.__name__!r} object has no attribute {name!r}")
+        pattern = compile_pattern(sources.pop(name))
+        setattr(self, name, pattern)
+        return pattern
+
     def _init_captures(self, grammar: dict, key: str = "captures", **kwargs) -> dict:
-        """Initializes a captures dictionary"""
+        """Initializes a captures dictionary
+
+        Identical capture grammars, which are often repeated in begin and end captures, share a single
+        parser per language. Begin/end and begin/while captures are not shared.
+        """
         captures = {}
         if key in grammar:
             for group_id, pattern in grammar[key].items():
-                captures[int(group_id)] = self.initialize(
-                    pattern, language_parser=self.language_parser, is_capture=True
-                )
+                if self.language_parser is None or "begin" in pattern:
+                    captures[int(group_id)] = self.initialize(
+                        pattern, language_parser=self.language_parser, is_capture=True
+                    )
+                    continue
+                fingerprint = json.dumps(pattern, sort_keys=True)
+                parser = self.language_parser._capture_parsers.get(fingerprint)
+                if parser is None:
+                    parser = self.initialize(
+                        pattern, language_parser=self.language_parser, is_capture=True
+                    )
+                    self.language_parser._capture_parsers[fingerprint] = parser
+                captures[int(group_id)] = parser
         return captures
 
     def _find_include(self, key: str, **kwargs) -> GrammarParser:
@@ -224,22 +261,22 @@ class TokenParser(GrammarParser):
 
         When no regex patterns are provided. The element is created between the initial and boundary positions.
         """
-        content = handler.read_pos(starting, boundary)
         elements: list[Capture | ContentElement] = [
             ContentElement(
                 token=self.token,
                 grammar=self.grammar,
-                content=content,
-                characters=handler.chars(starting, boundary),
+                handler=handler,
+                span=(starting, boundary),
             )
         ]
         handler.anchor = boundary[1]
-        LOGGER.info(
-            f"{self.__class__.__name__} found < {repr(content)} >",
-            self,
-            starting,
-            kwargs.get("depth", 0),
-        )
+        if LOGGER.is_enabled_for(logging.INFO):
+            LOGGER.info(
+                f"{self.__class__.__name__} found < {repr(handler.read_pos(starting, boundary))} >",
+                self,
+                starting,
+                kwargs.get("depth", 0),
+            )
         return True, elements, (starting, boundary)
 
 
@@ -248,7 +285,7 @@ class MatchParser(GrammarParser):
 
     def __init__(self, grammar: dict, **kwargs) -> None:
         super().__init__(grammar, **kwargs)
-        self.exp_match = re.compile(grammar["match"])
+        self.exp_match = compile_pattern(grammar["match"])
         self.parsers = self._init_captures(grammar, key="captures")
         if "\\G" in grammar["match"]:
             self.anchored = True
@@ -311,8 +348,9 @@ class MatchParser(GrammarParser):
                     token=self.token,
                     grammar=self.grammar,
                     content=content,
-                    characters=handler.chars(*span),
                     children=captures,
+                    handler=handler,
+                    span=span,
                 )
             ]
         else:
@@ -322,13 +360,26 @@ class MatchParser(GrammarParser):
 
 
 class ParserHasPatterns(GrammarParser, ABC):
-    def __init__(self, grammar: dict, **kwargs) -> None:
+    def __init__(self, grammar: dict, init_patterns: bool = True, **kwargs) -> None:
         super().__init__(grammar, **kwargs)
-        self.patterns = [
+        self.patterns = self._init_patterns(grammar) if init_patterns else []
+        self._enabled_patterns: list | None = None
+        self._pattern_set: RegSet | None = None
+        self._pattern_set_parsers: set[GrammarParser] | None = None
+
+    def _init_patterns(self, grammar: dict) -> list:
+        """Initializes the parsers of the sub patterns of the grammar."""
+        return [
             self.initialize(pattern, language_parser=self.language_parser)
             for pattern in grammar.get("patterns", [])
         ]
 
+    def __getstate__(self) -> dict:
+        # The pattern set is compiled again on first use
+        state = super().__getstate__()
+        state.update(_pattern_set=None, _pattern_set_parsers=None)
+        return state
+
     def _initialize_repository(self):
         """When the grammar has patterns, this method should called to initialize its inclusions."""
         self.initialized = True
@@ -354,6 +405,82 @@ class ParserHasPatterns(GrammarParser, ABC):
             elif self.is_capture:
                 self.patterns.append(injection_pattern)
 
+    def _get_enabled_patterns(self) -> list:
+        """Returns the sub patterns that are not disabled.
+
+        The list is collected on first use, after the repository has been initialized, and reused by
+        every subsequent parse. It must not be modified by the caller.
+        """
+        if self._enabled_patterns is None:
+            self._enabled_patterns = [parser for parser in self.patterns if not parser.disabled]
+        return self._enabled_patterns
+
+    def _compile_pattern_set(self) -> set[GrammarParser]:
+        """Compiles the leading regexes of the sub patterns into a single oniguruma regset.
+
+        Only match and begin/end parsers that are not anchored with \\G are included, as their leading
+        regex must match on the current line for the parser to succeed. End of stream patterns are
+        excluded, as these are always searched greedily. No regset is compiled when another regex
+        engine is selected, as the scan would still call into oniguruma on every parse round.
+
+        :return: The set of parsers included in the regset.
+        """
+        if pattern_utils.REGEX_ENGINE != "oniguruma":
+            return set()
+
+        leading: dict[GrammarParser, str] = {}
+        for parser in self._get_enabled_patterns():
+            if isinstance(parser, MatchParser):
+                pattern = parser.exp_match._pattern
+            elif isinstance(parser, BeginEndParser):
+                pattern = parser.exp_begin._pattern
+            else:
+                continue
+            # End of stream patterns are always matched greedily, see ContentHandler.search
+            if not parser.anchored and pattern not in ["\\z", "\\Z"]:
+                leading[parser] = pattern
+
+        if not leading:
+            return set()
+        try:
+            self._pattern_set = re.compile_regset(*leading.values())
+        except re.OnigError:
+            LOGGER.debug(f"{self.__class__.__name__} could not compile regset", self)
+            return set()
+        return set(leading)
+
+    def _candidate_patterns(
+        self,
+        handler: ContentHandler,
+        starting: POS,
+        boundary: POS | None,
+        patterns: list,
+    ) -> tuple[list, list]:
+        """Removes the sub patterns that can not match on the remainder of the current line.
+
+        The leading regexes of the sub patterns are scanned in a single pass. If none of them match,
+        only the sub patterns that are not part of the regset have to be tried. If the earliest match
+        is preceded by non-whitespace characters, the same holds when no leading characters are allowed.
+
+        :return: A tuple of the candidate patterns when no leading characters are allowed, and the
+            candidate patterns when leading characters are allowed (greedy).
+        """
+        if self._pattern_set_parsers is None:
+            self._pattern_set_parsers = self._compile_pattern_set()
+        if self._pattern_set is None:
+            return patterns, patterns
+
+        earliest = handler.search_set(self._pattern_set, starting, boundary)
+        if earliest is None:
+            remaining = [parser for parser in patterns if parser not in self._pattern_set_parsers]
+            return remaining, remaining
+
+        leading_string = handler.lines[starting[0]][starting[1] : earliest]
+        if leading_string and not leading_string.isspace():
+            remaining = [parser for parser in patterns if parser not in self._pattern_set_parsers]
+            return remaining, patterns
+        return patterns, patterns
+
 
 class PatternsParser(ParserHasPatterns):
     """The parser for grammars for which several patterns are provided."""
@@ -375,12 +502,16 @@ class PatternsParser(ParserHasPatterns):
 
         parsed = False
         elements: list[Capture | ContentElement] = []
-        patterns = [parser for parser in self.patterns if not parser.disabled]
+        patterns = self._get_enabled_patterns()
 
         current = (starting[0], starting[1])
 
         while current < boundary:
-            for parser in patterns:
+            parsed = False
+            candidates, greedy_candidates = self._candidate_patterns(
+                handler, current, boundary, patterns
+            )
+            for parser in greedy_candidates if greedy else candidates:
                 # Try to find patterns
                 parsed, captures, span = parser._parse(
                     handler,
@@ -407,8 +538,8 @@ class PatternsParser(ParserHasPatterns):
 
             if not parsed and not greedy:
                 # Try again if previously allowed no leading white space charaters, only when multple patterns are to be found
-                options_span, options_elements = {}, {}
-                for parser in patterns:
+                options: list[tuple] = []
+                for index, parser in enumerate(greedy_candidates):
                     parsed, captures, span = parser._parse(
                         handler,
                         current,
@@ -417,8 +548,7 @@ class PatternsParser(ParserHasPatterns):
                         **kwargs,
                     )
                     if parsed:
-                        options_span[parser] = span
-                        options_elements[parser] = captures
+                        options.append((span[0], index, parser, span, captures))
                         LOGGER.debug(
                             f"{self.__class__.__name__} found pattern choice",
                             self,
@@ -426,16 +556,11 @@ class PatternsParser(ParserHasPatterns):
                             kwargs.get("depth", 0),
                         )
 
-                if options_span:
-                    parser = sorted(
-                        options_span,
-                        key=lambda parser: (
-                            *options_span[parser][0],
-                            patterns.index(parser),
-                        ),
-                    )[0]
-                    current = options_span[parser][1]
-                    elements.extend(options_elements[parser])
+                if options:
+                    # Choose the earliest option, prioritizing the order of the patterns
+                    _, _, parser, span, captures = min(options, key=lambda option: option[:2])
+                    current = span[1]
+                    elements.extend(captures)
                     LOGGER.info(
                         f"{self.__class__.__name__} chosen pattern of {parser}",
                         self,
@@ -475,22 +600,19 @@ class PatternsParser(ParserHasPatterns):
 
             line_length = handler.line_lengths[current[0]]
             if current[1] in [line_length, line_length - 1]:
-                try:
-                    empty_lines = next(
-                        i for i, v in enumerate(handler.line_lengths[current[0] + 1 :]) if v > 1
-                    )
-                    current = (current[0] + 1 + empty_lines, 0)
-                except StopIteration:
+                content_line = handler.next_content_line(current[0] + 1)
+                if content_line is None:
                     break
+                current = (content_line, 0)
 
         if self.token:
             elements = [
                 ContentElement(
                     token=self.token,
                     grammar=self.grammar,
-                    content=handler.read_pos(starting, boundary),
-                    characters=handler.chars(starting, boundary),
                     children=elements,
+                    handler=handler,
+                    span=(starting, boundary),
                 )
             ]
 
@@ -503,14 +625,13 @@ class BeginEndParser(ParserHasPatterns):
     def __init__(self, grammar: dict, **kwargs) -> None:
         super().__init__(grammar, **kwargs)
         if "contentName" in grammar:
-            self.token = grammar["contentName"]
+            self.token = sys.intern(grammar["contentName"])
             self.between_content = True
         else:
-            self.token = grammar.get("name")
             self.between_content = False
         self.apply_end_pattern_last = grammar.get("applyEndPatternLast", False)
-        self.exp_begin = re.compile(grammar["begin"])
-        self.exp_end = re.compile(grammar["end"])
+        self.exp_begin = compile_pattern(grammar["begin"])
+        self.exp_end = compile_pattern(grammar["end"])
         self.parsers_begin = self._init_captures(grammar, key="beginCaptures")
         self.parsers_end = self._init_captures(grammar, key="endCaptures")
         if "\\G" in grammar["begin"]:
@@ -584,10 +705,13 @@ class BeginEndParser(ParserHasPatterns):
         # Define loop parameters
         end_elements: list[Capture | ContentElement] = []
         mid_elements: list[Capture | ContentElement] = []
-        patterns = [parser for parser in self.patterns if not parser.disabled]
+        patterns = self._get_enabled_patterns()
         first_run = True
 
         while current <= boundary:
+            candidates, greedy_candidates = self._candidate_patterns(
+                handler, current, boundary, patterns
+            )
             parsed = False
 
             # Create boolean that is enabled when a parser is recursively called. In this its end pattern should
@@ -595,7 +719,7 @@ class BeginEndParser(ParserHasPatterns):
             apply_end_pattern_last = False
 
             # Try to find patterns first with no leading whitespace charaters allowed
-            for parser in patterns:
+            for parser in candidates:
                 parsed, capture_elements, capture_span = parser._parse(
                     handler, current, boundary=boundary, greedy=False, **kwargs
                 )
@@ -631,8 +755,8 @@ class BeginEndParser(ParserHasPatterns):
                     kwargs.get("depth", 0),
                 )
 
-                options_span, options_elements = {}, {}
-                for parser in patterns:
+                options: list[tuple] = []
+                for index, parser in enumerate(greedy_candidates):
                     parsed, capture_elements, capture_span = parser._parse(
                         handler,
                         current,
@@ -641,8 +765,9 @@ class BeginEndParser(ParserHasPatterns):
                         **kwargs,
                     )
                     if parsed:
-                        options_span[parser] = capture_span
-                        options_elements[parser] = capture_elements
+                        options.append(
+                            (capture_span[0], index, parser, capture_span, capture_elements)
+                        )
                         LOGGER.debug(
                             f"{self.__class__.__name__} found pattern choice",
                             self,
@@ -650,17 +775,12 @@ class BeginEndParser(ParserHasPatterns):
                             kwargs.get("depth", 0),
                         )
 
-                if options_span:
+                if options:
                     parsed = True
-                    parser = sorted(
-                        options_span,
-                        key=lambda parser: (
-                            *options_span[parser][0],
-                            patterns.index(parser),
-                        ),
-                    )[0]
-                    capture_span = options_span[parser]
-                    capture_elements = options_elements[parser]
+                    # Choose the earliest option, prioritizing the order of the patterns
+                    _, _, parser, capture_span, capture_elements = min(
+                        options, key=lambda option: option[:2]
+                    )
 
                     if parser == self:
                         apply_end_pattern_last = True
@@ -827,13 +947,13 @@ class BeginEndParser(ParserHasPatterns):
 
         start = begin_span[1] if self.between_content else begin_span[0]
 
-        content = handler.read_pos(start, closing)
-        LOGGER.info(
-            f"{self.__class__.__name__} found < {repr(content)} >",
-            self,
-            start,
-            kwargs.get("depth", 0),
-        )
+        if LOGGER.is_enabled_for(logging.INFO):
+            LOGGER.info(
+                f"{self.__class__.__name__} found < {repr(handler.read_pos(start, closing))} >",
+                self,
+                start,
+                kwargs.get("depth", 0),
+            )
 
         # Construct output elements
         if self.token:
@@ -841,9 +961,9 @@ class BeginEndParser(ParserHasPatterns):
                 ContentBlockElement(
                     token=self.token,
                     grammar=self.grammar,
-                    content=content,
-                    characters=handler.chars(start, closing),
                     children=mid_elements,
+                    handler=handler,
+                    span=(start, closing),
                     begin=begin_elements,
                     end=end_elements,
                 )
@@ -860,13 +980,12 @@ class BeginWhileParser(PatternsParser):
     def __init__(self, grammar: dict, **kwargs) -> None:
         super().__init__(grammar, **kwargs)
         if "contentName" in grammar:
-            self.token = grammar["contentName"]
+            self.token = sys.intern(grammar["contentName"])
             self.between_content = True
         else:
-            self.token = grammar.get("name")
             self.between_content = False
-        self.exp_begin = re.compile(grammar["begin"])
-        self.exp_while = re.compile(grammar["while"])
+        self.exp_begin = compile_pattern(grammar["begin"])
+        self.exp_while = compile_pattern(grammar["while"])
         self.parsers_begin = self._init_captures(grammar, key="beginCaptures")
         self.parsers_while = self._init_captures(grammar, key="whileCaptures")
 
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import pickle
+import sys
 from pathlib import Path
 
+from .. import __version__
 from ..elements import Capture, ContentElement
 from ..handler import POS, ContentHandler
 from ..parser import GrammarParser, PatternsParser
@@ -11,6 +16,9 @@ from ..utils.logger import LOGGER
 
 LANGUAGE_PARSERS = {}
 
+# The attributes of a language parser that are stored by LanguageParser.compile_to_disk
+COMPILED_ATTRIBUTES = ["repository", "patterns", "injections", "initialized"]
+
 
 class DummyParser(GrammarParser):
     """A dummy parser object"""
@@ -29,12 +37,17 @@ class DummyParser(GrammarParser):
 class LanguageParser(PatternsParser):
     """The parser of a language grammar."""
 
-    def __init__(self, grammar: dict, **kwargs):
+    def __init__(self, grammar: dict, compiled_path: str | Path | None = None, **kwargs):
         """
         Initialize a Language object.
 
         :param grammar: The grammar definition for the language.
         :type grammar: dict
+        :param compiled_path: The path of a parser graph stored by :meth:`compile_to_disk`, which is loaded
+            instead of building the patterns and repository if it was compiled from the same grammar. The
+            graph is unpickled, which can execute arbitrary code, so the file must be trusted. Its grammar
+            hash only detects outdated files. Defaults to None.
+        :type compiled_path: str | Path | None
         :param pre_processor: A pre-processor to use on the input string of the parser
         :type pre_processor: BasePreProcessor
         :param kwargs: Additional keyword arguments.
@@ -46,31 +59,42 @@ class LanguageParser(PatternsParser):
         :ivar repository: The repository of grammar rules for the language.
         :ivar injections: The list of injection rules for the language.
         :ivar _cache: The cache object for the language.
+        :ivar _capture_parsers: The shared capture parsers of the language by their grammar.
         """
+        self._capture_parsers: dict[str, GrammarParser] = {}
 
+        # The patterns are only initialized when no compiled parser graph is loaded
         super().__init__(
-            grammar, key=grammar.get("name", "myLanguage"), language_parser=self, **kwargs
+            grammar,
+            key=grammar.get("name", "myLanguage"),
+            language_parser=self,
+            init_patterns=False,
+            **kwargs,
         )
 
         self.name = grammar.get("name", "")
         self.uuid = grammar.get("uuid", "")
         self.file_types = grammar.get("fileTypes", [])
-        self.token = grammar.get("scopeName", "myScope")
+        self.token = sys.intern(grammar.get("scopeName", "myScope"))
         self.repository = {}
         self.injections: list[dict] = []
         self._cache: TextmateCache = init_cache()
 
-        # Initialize grammars in repository
+        # Update language parser store
+        language_name = grammar.get("scopeName", "myLanguage")
+        LANGUAGE_PARSERS[language_name] = self
+
+        if compiled_path is not None and self._load_compiled(Path(compiled_path)):
+            return
+
+        # Initialize grammars in patterns and repository
+        self.patterns = self._init_patterns(grammar)
         for repo in _gen_repositories(grammar):
             for key, parser_grammar in repo.items():
                 self.repository[key] = GrammarParser.initialize(
                     parser_grammar, key=key, language_parser=self
                 )
 
-        # Update language parser store
-        language_name = grammar.get("scopeName", "myLanguage")
-        LANGUAGE_PARSERS[language_name] = self
-
         self._initialize_repository()
 
     def pre_process(self, input: str) -> str:
@@ -112,6 +136,55 @@ class LanguageParser(PatternsParser):
 
         super()._initialize_repository()
 
+    def compile_to_disk(self, path: str | Path) -> None:
+        """
+        Stores the initialized parser graph of the language to disk.
+
+        The stored graph can be loaded by passing its path as ``compiled_path`` when the language parser is
+        initialized, which skips building the patterns and repository. Compiled patterns are stored by their
+        source and are compiled again on first use after the graph is loaded.
+
+        :param path: The path of the file to store the parser graph in.
+        :return: None
+        """
+        if self._injects_other_languages():
+            raise ValueError(
+                "Languages with injections into other languages can not be compiled to disk"
+            )
+        state = {attribute: getattr(self, attribute) for attribute in COMPILED_ATTRIBUTES}
+        with open(path, "wb") as file:
+            file.write(_grammar_hash(self.grammar).encode() + b"\n")
+            _GraphPickler(file, self).dump(state)
+
+    def _injects_other_languages(self) -> bool:
+        """Checks whether the grammar has injections into other languages, which are not compiled to disk."""
+        for key in self.grammar.get("injections", {}):
+            target_string = key.split("-")[0].strip()
+            if target_string and target_string != self.token:
+                return True
+        return False
+
+    def _load_compiled(self, path: Path) -> bool:
+        """Loads the parser graph stored by compile_to_disk, if it was compiled from the current grammar."""
+        if self._injects_other_languages() or not path.exists():
+            return False
+        try:
+            with open(path, "rb") as file:
+                if file.readline().strip() != _grammar_hash(self.grammar).encode():
+                    LOGGER.info(
+                        f"compiled parser graph {path} is outdated, building the repository"
+                    )
+                    return False
+                state = _GraphUnpickler(file, self).load()
+            attributes = {attribute: state[attribute] for attribute in COMPILED_ATTRIBUTES}
+        except Exception:
+            # Unpickling a corrupted or foreign file can fail in many ways
+            LOGGER.warning(f"could not load compiled parser graph {path}, building the repository")
+            return False
+        for attribute, value in attributes.items():
+            setattr(self, attribute, value)
+        return True
+
     def parse_file(self, filePath: str | Path, **kwargs) -> ContentElement | None:
         """
         Parses an entire file with the current grammar.
@@ -129,6 +202,10 @@ class LanguageParser(PatternsParser):
         if self._cache.cache_valid(filePath):
             element = self._cache.load(filePath)
         else:
+            # Empty files are not read or parsed
+            if filePath.exists() and filePath.stat().st_size == 0:
+                return None
+
             handler = ContentHandler.from_path(filePath, pre_processor=self.pre_process, **kwargs)
             if handler.content == "":
                 return None
@@ -147,8 +224,11 @@ class LanguageParser(PatternsParser):
 
         :param input: The input string to be parsed.
         :param kwargs: Additional keyword arguments.
-        :return: The result of parsing the input string.
+        :return: The result of parsing the input string, None if the input string is empty.
         """
+        if input == "":
+            return None
+
         handler = ContentHandler(input, pre_processor=self.pre_process, **kwargs)
 
         # Configure logger
@@ -168,6 +248,9 @@ class LanguageParser(PatternsParser):
             element._dispatch(nested=True)  # type: ignore
         else:
             element = None
+
+        # The parsed elements read their content lazily from the handler, release the search results
+        handler._search_cache.clear()
         return element  # type: ignore
 
     def _parse(
@@ -190,3 +273,35 @@ def _gen_repositories(grammar, key="repository"):
                 for d in v:
                     for result in _gen_repositories(d, key):
                         yield result
+
+
+def _grammar_hash(grammar: dict) -> str:
+    """Hashes a grammar together with the package version that its parser graph is compiled with."""
+    serialized = json.dumps([__version__, grammar], sort_keys=True)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class _GraphPickler(pickle.Pickler):
+    """Pickles a parser graph, storing the language parsers by reference."""
+
+    def __init__(self, file, language_parser: LanguageParser) -> None:
+        super().__init__(file)
+        self.language_parser = language_parser
+
+    def persistent_id(self, obj):
+        if isinstance(obj, LanguageParser):
+            return "" if obj is self.language_parser else obj.token
+        return None
+
+
+class _GraphUnpickler(pickle.Unpickler):
+    """Unpickles a parser graph stored by _GraphPickler."""
+
+    def __init__(self, file, language_parser: LanguageParser) -> None:
+        super().__init__(file)
+        self.language_parser = language_parser
+
+    def persistent_load(self, pid):
+        if pid:
+            return LANGUAGE_PARSERS.get(pid, DummyParser())
+        return self.language_parser
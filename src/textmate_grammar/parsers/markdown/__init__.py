@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import shutil
+from functools import cache
 from pathlib import Path
 
 import yaml
@@ -8,20 +9,26 @@ import yaml
 from ..base import LanguageParser
 
 
-class MarkdownParser(LanguageParser):
-    def __init__(self, **kwargs):
-        tmLanguageFile = (
-            Path(__file__).parents[3] / "syntaxes" / "markdown" / "markdown.tmLanguage.base.yaml"
-        )
-        tmLanguageYAML = Path(__file__).parent / "grammar.yaml"
+@cache
+def _load_grammar() -> dict:
+    """Loads the markdown grammar once, the loaded grammar is shared by all parser instances."""
+    tmLanguageFile = (
+        Path(__file__).parents[3] / "syntaxes" / "markdown" / "markdown.tmLanguage.base.yaml"
+    )
+    tmLanguageYAML = Path(__file__).parent / "grammar.yaml"
+
+    if tmLanguageFile.exists():
+        shutil.copyfile(tmLanguageFile, tmLanguageYAML)
 
-        if tmLanguageFile.exists():
-            shutil.copyfile(tmLanguageFile, tmLanguageYAML)
+    with open(tmLanguageYAML) as file:
+        try:
+            grammar = yaml.load(file.read(), Loader=yaml.CLoader)
+        except ImportError:
+            grammar = yaml.load(file.read(), Loader=yaml.Loader)
+    return grammar
 
-        with open(tmLanguageYAML) as file:
-            try:
-                grammar = yaml.load(file.read(), Loader=yaml.CLoader)
-            except ImportError:
-                grammar = yaml.load(file.read(), Loader=yaml.Loader)
 
+class MarkdownParser(LanguageParser):
+    def __init__(self, **kwargs):
+        grammar = _load_grammar()
         super().__init__(grammar, **kwargs)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import plistlib
 import re
+from functools import cache
 from pathlib import Path
 
 import yaml
@@ -9,6 +10,33 @@ import yaml
 from ..base import LanguageParser
 
 
+@cache
+def _load_grammar() -> dict:
+    """Loads the MATLAB grammar once, the loaded grammar is shared by all parser instances."""
+    tmLanguageFile = (
+        Path(__file__).parents[4]
+        / "syntaxes"
+        / "matlab"
+        / "Matlab.tmbundle"
+        / "Syntaxes"
+        / "MATLAB.tmLanguage"
+    )
+    tmLanguageYAML = Path(__file__).parent / "grammar.yaml"
+
+    if tmLanguageFile.exists():
+        with open(tmLanguageFile, "rb") as tmFile:
+            grammar = plistlib.load(tmFile, fmt=plistlib.FMT_XML)
+        with open(tmLanguageYAML, "w") as ymlFile:
+            ymlFile.write(yaml.dump(grammar, indent=2))
+    else:
+        with open(tmLanguageYAML) as ymlFile:
+            try:
+                grammar = yaml.load(ymlFile.read(), Loader=yaml.CLoader)
+            except ImportError:
+                grammar = yaml.load(ymlFile.read(), Loader=yaml.Loader)
+    return grammar
+
+
 class MatlabParser(LanguageParser):
     """
     Represents a grammar for the MATLAB language.
@@ -23,29 +51,7 @@ class MatlabParser(LanguageParser):
         """
 
         self._rlc = remove_line_continuations
-
-        tmLanguageFile = (
-            Path(__file__).parents[4]
-            / "syntaxes"
-            / "matlab"
-            / "Matlab.tmbundle"
-            / "Syntaxes"
-            / "MATLAB.tmLanguage"
-        )
-        tmLanguageYAML = Path(__file__).parent / "grammar.yaml"
-
-        if tmLanguageFile.exists():
-            with open(tmLanguageFile, "rb") as tmFile:
-                grammar = plistlib.load(tmFile, fmt=plistlib.FMT_XML)
-            with open(tmLanguageYAML, "w") as ymlFile:
-                ymlFile.write(yaml.dump(grammar, indent=2))
-        else:
-            with open(tmLanguageYAML) as ymlFile:
-                try:
-                    grammar = yaml.load(ymlFile.read(), Loader=yaml.CLoader)
-                except ImportError:
-                    grammar = yaml.load(ymlFile.read(), Loader=yaml.Loader)
-
+        grammar = _load_grammar()
         super().__init__(grammar, **kwargs)
 
     def pre_process(self, input: str) -> str:
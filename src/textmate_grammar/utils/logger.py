@@ -122,6 +122,10 @@ class Logger:
 
         return f"{self.scope}:{msg_pos}:{msg_id}: {vb_message}"
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Checks whether messages of the given level are logged, to skip building costly messages."""
+        return self.logger.getEffectiveLevel() <= level
+
     def debug(self, *args, **kwargs) -> None:
         if self.logger.getEffectiveLevel() > logging.DEBUG:
             return
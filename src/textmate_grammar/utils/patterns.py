@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import os
+import re
+import warnings
+from typing import Any, Protocol
+
+from onigurumacffi import compile
+
+from .logger import LOGGER
+
+try:
+    import regex
+except ImportError:  # pragma: no cover
+    regex = None
+
+# The regex engine used to compile grammar patterns, either "oniguruma", "regex" or "stdlib". Patterns that are
+# not supported by the selected engine, or that have a different meaning in it, are compiled with oniguruma.
+REGEX_ENGINE = os.environ.get("TEXTMATE_GRAMMAR_REGEX_ENGINE", "oniguruma")
+
+# A single character matcher: a character class, a shorthand class escape, an escaped symbol, a dot
+# or a literal character.
+_ATOM = r"\[(?:\\.|\[:\^?[a-z]+:\]|[^\]\\])+\]|\\[wWsSdDhH]|\\[^A-Za-z0-9]|\.|[^\\\[\](){}|*+?^$.]"
+
+# A non-capturing group around a single quantified atom, which is quantified again, e.g. (?:\w*)+.
+# The inner and outer quantifiers may not be lazy or possessive.
+_NESTED_QUANTIFIER = re.compile(rf"\(\?:({_ATOM})([*+?])\)([*+])(?![?+])")
+
+
+def rewrite_nested_quantifiers(pattern: str) -> str:
+    """
+    Rewrites nested quantifiers of a single atom into a single quantifier.
+
+    Patterns such as ``(?:\\w*)+`` match exactly the same strings as ``\\w*``, in the same order of
+    preference, but the nested quantifiers can be backtracked in exponentially many ways when the
+    remainder of the pattern fails to match. Only non-capturing groups containing a single atom are
+    rewritten, such that the capture groups and the semantics of the pattern are preserved.
+
+    :param pattern: The oniguruma regex pattern.
+    :return: The rewritten pattern.
+    """
+    if "(?:" not in pattern:
+        return pattern
+
+    rewritten = ""
+    index = 0
+    in_class = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            rewritten += pattern[index : index + 2]
+            index += 2
+            continue
+        if char == "[":
+            in_class += 1
+        elif char == "]" and in_class:
+            in_class -= 1
+        elif char == "(" and not in_class:
+            matching = _NESTED_QUANTIFIER.match(pattern, index)
+            if matching:
+                atom, inner, outer = matching.groups()
+                quantifier = "+" if inner == "+" and outer == "+" else "*"
+                rewritten += atom + quantifier
+                index = matching.end()
+                continue
+        rewritten += char
+        index += 1
+
+    if rewritten != pattern:
+        LOGGER.debug(f"rewrote nested quantifiers of < {pattern} > to < {rewritten} >")
+    return rewritten
+
+
+# Oniguruma syntax that is either unsupported or has a different meaning in other regex engines: the \h
+# and \H hex digit classes, the \N non-newline class, the \z and \Z string ends, option groups such as
+# (?m), which means dotall in oniguruma, character class intersections, and named groups and their
+# backreferences, as plain groups do not capture in oniguruma once a pattern has a named group.
+_NOT_PORTABLE = re.compile(r"\\[hHzZN]|\(\?[a-zA-Z-]+[:)]|&&|\(\?<[A-Za-z]|\\k<")
+
+
+def _is_portable(pattern: str) -> bool:
+    """Checks whether an oniguruma pattern has the same meaning in other regex engines."""
+    if _NOT_PORTABLE.search(pattern):
+        return False
+
+    # Nested character classes are only supported by oniguruma
+    index = 0
+    in_class = False
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "[":
+            if in_class and not pattern.startswith("[:", index):
+                return False
+            in_class = True
+        elif char == "]" and in_class:
+            in_class = False
+        index += 1
+    return True
+
+
+class Pattern(Protocol):
+    """Interface of a compiled grammar pattern, as implemented by oniguruma patterns."""
+
+    _pattern: str
+
+    def number_of_captures(self) -> int:
+        """Returns the number of capture groups in the pattern."""
+        ...
+
+    def search(self, s: str, start: int = 0) -> Any:
+        """Searches the pattern in a string from a starting position."""
+        ...
+
+
+class RegexPattern:
+    """A pattern compiled with the ``regex`` or ``re`` module, with the interface of an oniguruma pattern."""
+
+    def __init__(self, pattern: str, compiled: Any) -> None:
+        """
+        Initialize a new instance of the RegexPattern class.
+
+        :param pattern: The source of the pattern.
+        :param compiled: The pattern compiled by the ``regex`` or ``re`` module.
+        """
+        self._pattern = pattern
+        self._compiled = compiled
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._pattern!r})"
+
+    def number_of_captures(self) -> int:
+        return self._compiled.groups
+
+    def search(self, s: str, start: int = 0) -> Any:
+        return self._compiled.search(s, start)
+
+
+def compile_pattern(pattern: str) -> Pattern:
+    """
+    Compiles a grammar regex pattern with the selected regex engine.
+
+    Patterns are compiled with oniguruma, unless another engine is selected with ``REGEX_ENGINE`` (or the
+    ``TEXTMATE_GRAMMAR_REGEX_ENGINE`` environment variable) and the pattern has the same meaning in it.
+
+    :param pattern: The oniguruma regex pattern.
+    :return: The compiled pattern.
+    """
+    pattern = rewrite_nested_quantifiers(pattern)
+    if REGEX_ENGINE == "regex" and regex is not None and _is_portable(pattern):
+        try:
+            return RegexPattern(pattern, regex.compile(pattern))
+        except regex.error:
+            LOGGER.debug(f"pattern < {pattern} > not supported by regex, using oniguruma")
+    elif REGEX_ENGINE == "stdlib" and "[:" not in pattern and _is_portable(pattern):
+        # POSIX bracket expressions are not supported by re, and sets that re may interpret differently in
+        # the future are rejected by turning its warning into an error
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", FutureWarning)
+                return RegexPattern(pattern, re.compile(pattern))
+        except (re.error, FutureWarning):
+            LOGGER.debug(f"pattern < {pattern} > not supported by re, using oniguruma")
+    return compile(pattern)
@@ -0,0 +1,57 @@
+import pytest
+
+from ...unit import MSG_NO_MATCH, MSG_NOT_PARSED
+
+test_vector = {}
+
+_quoted_string = {
+    "token": "string.quoted.single.matlab",
+    "begin": [{"token": "punctuation.definition.string.begin.matlab", "content": "'"}],
+    "end": [{"token": "punctuation.definition.string.end.matlab", "content": "'"}],
+}
+
+# command syntax with a cell array argument
+test_vector["d s = {'a', 'b'};"] = {
+    "token": "source.matlab",
+    "children": [
+        {
+            "token": "meta.function-call.command.matlab",
+            "children": [
+                {"token": "entity.name.function.command.matlab", "content": "d"},
+                {
+                    "token": "string.unquoted.matlab",
+                    "children": [
+                        {**_quoted_string, "content": "'a'"},
+                        {**_quoted_string, "content": "'b'"},
+                    ],
+                },
+            ],
+        },
+        {"token": "punctuation.terminator.semicolon.matlab", "content": ";"},
+    ],
+}
+
+# command syntax with an unmatched parenthesis
+test_vector["d ) {'a'}"] = {
+    "token": "source.matlab",
+    "children": [
+        {
+            "token": "meta.function-call.command.matlab",
+            "children": [
+                {"token": "entity.name.function.command.matlab", "content": "d"},
+                {
+                    "token": "string.unquoted.matlab",
+                    "children": [{**_quoted_string, "content": "'a'"}],
+                },
+            ],
+        },
+    ],
+}
+
+
+@pytest.mark.parametrize("check,expected", test_vector.items())
+def test_command_syntax(parser, check, expected):
+    """Test command syntax"""
+    element = parser.parse_string(check)
+    assert element, MSG_NO_MATCH
+    assert element.to_dict() == expected, MSG_NOT_PARSED
@@ -0,0 +1,10 @@
+def test_empty_string(parser):
+    """Test parsing an empty string"""
+    assert parser.parse_string("") is None
+
+
+def test_empty_file(parser, tmp_path):
+    """Test parsing an empty file"""
+    file_path = tmp_path / "empty.m"
+    file_path.touch()
+    assert parser.parse_file(file_path) is None
@@ -0,0 +1,43 @@
+import pytest
+from textmate_grammar.parser import ParserHasPatterns
+from textmate_grammar.utils import patterns
+
+from ...unit import MSG_NO_MATCH, MSG_NOT_PARSED
+
+# Lines on which scopes with only regset members as sub patterns have no candidates without leading
+# characters, as the earliest regset match is preceded by non-whitespace characters
+test_vector = [
+    "d s = {'a', 'b'};",
+    "d ) {'a'}",
+    "x = {'a' 'b'} ) y",
+    "x = [1 2] ) 3",
+    "disp hello world",
+]
+
+
+@pytest.mark.parametrize("check", test_vector)
+def test_pattern_set(parser, monkeypatch, check):
+    """Test that prefiltering the sub patterns with a regset does not change the parsed output"""
+    # The regset prefilter is only used with the oniguruma engine
+    monkeypatch.setattr(patterns, "REGEX_ENGINE", "oniguruma")
+    candidate_patterns = ParserHasPatterns._candidate_patterns
+    no_candidates = []
+
+    def record_candidates(self, handler, starting, boundary, patterns):
+        candidates, greedy_candidates = candidate_patterns(
+            self, handler, starting, boundary, patterns
+        )
+        if patterns and not candidates and set(patterns) <= self._pattern_set_parsers:
+            no_candidates.append(self)
+        return candidates, greedy_candidates
+
+    monkeypatch.setattr(ParserHasPatterns, "_candidate_patterns", record_candidates)
+    element = parser.parse_string(check)
+    assert element, MSG_NO_MATCH
+    assert no_candidates
+
+    monkeypatch.setattr(
+        ParserHasPatterns, "_candidate_patterns", lambda self, *args: (args[-1], args[-1])
+    )
+    expected = parser.parse_string(check)
+    assert element.to_dict(all_content=True) == expected.to_dict(all_content=True), MSG_NOT_PARSED
@@ -0,0 +1,47 @@
+import pickle
+
+import pytest
+from textmate_grammar.parser import GrammarParser
+from textmate_grammar.parsers.base import _grammar_hash
+from textmate_grammar.parsers.matlab import MatlabParser, _load_grammar
+
+source = "x = [1 2]; % comment\nif x, disp('it''s'), end\n"
+
+
+def test_compile_to_disk(tmp_path):
+    """Test loading a parser graph compiled to disk"""
+    path = tmp_path / "matlab.graph"
+    MatlabParser().compile_to_disk(path)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(GrammarParser, "initialize", pytest.fail)
+        parser = MatlabParser(compiled_path=path)
+    assert "exp_begin" not in parser.repository["comments"].patterns[0].__dict__
+    assert parser.parse_string(source).flatten() == MatlabParser().parse_string(source).flatten()
+
+
+def test_compile_to_disk_outdated(tmp_path):
+    """Test that a parser graph compiled from another grammar is not loaded"""
+    path = tmp_path / "matlab.graph"
+    path.write_text("outdated\n")
+    parser = MatlabParser(compiled_path=path)
+    assert "exp_begin" in parser.repository["comments"].patterns[0].__dict__
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"\xff\xfe\x00\x01",
+        _grammar_hash(_load_grammar()).encode() + b"\n" + b"\xff\xfe\x00\x01",
+        _grammar_hash(_load_grammar()).encode() + b"\n" + pickle.dumps({}),
+        _grammar_hash(_load_grammar()).encode() + b"\n" + pickle.dumps([1]),
+        _grammar_hash(_load_grammar()).encode() + b"\n" + b"cno_such_module\nname\n.",
+    ],
+    ids=["not utf-8", "corrupted", "missing attributes", "not a dict", "missing module"],
+)
+def test_compile_to_disk_corrupted(tmp_path, content):
+    """Test that a corrupted parser graph is not loaded"""
+    path = tmp_path / "matlab.graph"
+    path.write_bytes(content)
+    parser = MatlabParser(compiled_path=path)
+    assert "exp_begin" in parser.repository["comments"].patterns[0].__dict__
+    assert parser.parse_string(source).flatten() == MatlabParser().parse_string(source).flatten()
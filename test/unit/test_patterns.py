@@ -0,0 +1,78 @@
+import pytest
+from textmate_grammar.utils import patterns
+from textmate_grammar.utils.patterns import rewrite_nested_quantifiers
+
+test_vector = {
+    r"(?:\w*)+x": r"\w*x",
+    r"(?:[a-z]+)+": r"[a-z]+",
+    r"(?:a?)*": r"a*",
+    r"(?:[[:alpha:]_]*)*\b": r"[[:alpha:]_]*\b",
+    r"(?:\.+)*": r"\.*",
+    # Capture groups, lazy and possessive quantifiers and multiple atoms are not rewritten
+    r"(\w*)+": r"(\w*)+",
+    r"(?:\w*)+?": r"(?:\w*)+?",
+    r"(?:\w*+)+": r"(?:\w*+)+",
+    r"(?:ab*)+": r"(?:ab*)+",
+    r"\(?:a*)+": r"\(?:a*)+",
+    r"[(?:a*)+]": r"[(?:a*)+]",
+}
+
+
+@pytest.mark.parametrize("check,expected", test_vector.items())
+def test_rewrite_nested_quantifiers(check, expected):
+    """Test rewriting of nested quantifiers"""
+    assert rewrite_nested_quantifiers(check) == expected
+
+
+@pytest.mark.parametrize(
+    "check,portable",
+    [
+        (r"\b(if|else)\b", True),
+        (r"[[:alpha:]_]\w*", True),
+        (r"0[xX]\h+", False),
+        (r"\N+$", False),
+        (r"(?i)end", False),
+        (r"[a-z&&[^aeiou]]", False),
+        (r"\z", False),
+        (r"(?<a>x)(y)(z)", False),
+        (r"(?<q>['\"]).*?\k<q>", False),
+        (r"(?<=\s)end(?<!x)", True),
+    ],
+)
+def test_regex_engine(monkeypatch, check, portable):
+    """Test compiling patterns with the regex engine"""
+    pytest.importorskip("regex")
+    monkeypatch.setattr(patterns, "REGEX_ENGINE", "regex")
+    assert isinstance(patterns.compile_pattern(check), patterns.RegexPattern) == portable
+
+
+@pytest.mark.parametrize(
+    "check,portable",
+    [
+        (r"\b(if|else)\b", True),
+        (r"[[:alpha:]_]\w*", False),
+        (r"\G\s*", False),
+        (r"(?<=^|\s)end", False),
+        (r"[[a-z]&&[^aeiou]]", False),
+    ],
+)
+def test_stdlib_engine(monkeypatch, check, portable):
+    """Test compiling patterns with the stdlib re engine"""
+    monkeypatch.setattr(patterns, "REGEX_ENGINE", "stdlib")
+    assert isinstance(patterns.compile_pattern(check), patterns.RegexPattern) == portable
+
+
+def test_stdlib_engine_pattern_set(monkeypatch):
+    """Test that the oniguruma regset prefilter is skipped with the stdlib re engine"""
+    from textmate_grammar.handler import ContentHandler
+    from textmate_grammar.parsers.matlab import MatlabParser
+
+    source = "x = [1 2]; % comment\nif x, disp('it''s'), end\n"
+    expected = MatlabParser().parse_string(source).to_dict(all_content=True)
+
+    def search_set(*args, **kwargs):
+        raise AssertionError("searched the oniguruma regset")
+
+    monkeypatch.setattr(patterns, "REGEX_ENGINE", "stdlib")
+    monkeypatch.setattr(ContentHandler, "search_set", search_set)
+    assert MatlabParser().parse_string(source).to_dict(all_content=True) == expected